@@ -10,96 +10,130 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.join(BASE_DIR, "src"))
 
 # Import modules
-from src.boolean_ir import boolean_search
-from src.vsm_ir import vsm_search
-from src.eval import compare_vsm_schemes
-from src.search_engine import corpus_statistics
+# Modul IR memuat corpus saat di-import; jika data/processed belum siap,
+# tampilkan pesan di halaman (rerun berikutnya akan mencoba import lagi)
+try:
+    from src.boolean_ir import boolean_search
+    from src.vsm_ir import vsm_search
+    from src.eval import compare_vsm_schemes
+    from src.search_engine import corpus_statistics
+except FileNotFoundError as e:
+    st.error(f"❌ Corpus belum tersedia: {e}")
+    st.stop()
+
+# ============================================================
+# ⚡ Cache hasil pencarian & evaluasi
+# ============================================================
+# Streamlit menjalankan ulang seluruh script di setiap interaksi widget;
+# fungsi-fungsi di bawah deterministik, jadi hasilnya cukup dihitung sekali
+# per kombinasi input.
+
+@st.cache_data(show_spinner=False)
+def _boolean_cached(query):
+    return boolean_search(query)
+
+@st.cache_data(show_spinner=False)
+def _vsm_cached(query, top_k, scheme):
+    return vsm_search(query, k=top_k, scheme=scheme, verbose=False)
+
+@st.cache_data(show_spinner=False)
+def _compare_cached(top_k):
+    return compare_vsm_schemes(top_k=top_k, truth_set=None, verbose=False)
+
+@st.cache_resource(show_spinner=False)
+def _corpus_stats_cached():
+    return corpus_statistics()
 
 # ============================================================
 # 🌙 Custom Dark Theme + Poppins Font
 # ============================================================
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-
-    html, body, [class*="st-"], .stApp {
-        font-family: 'Poppins', sans-serif;
-        background-color: #0d1117;
-        color: #f0f6fc;
-    }
-
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background-color: #161b22;
-        color: #f0f6fc;
-        font-family: 'Poppins', sans-serif;
-    }
-
-    /* Headings */
-    h1, h2, h3, h4 {
-        color: #58a6ff;
-        font-weight: 600;
-    }
-
-    /* Buttons */
-    div.stButton > button {
-        background-color: #238636;
-        color: #fff;
-        border-radius: 8px;
-        border: none;
-        padding: 0.5em 1em;
-        font-weight: 600;
-        transition: all 0.3s ease-in-out;
-        font-family: 'Poppins', sans-serif;
-    }
-    div.stButton > button:hover {
-        background-color: #2ea043;
-        transform: scale(1.03);
-        box-shadow: 0 0 12px rgba(46, 160, 67, 0.5);
-    }
-
-    /* Text input and sliders */
-    input, textarea, .stSlider, .stSelectbox {
-        background-color: #161b22 !important;
-        color: #f0f6fc !important;
-        border: 1px solid #30363d !important;
-        border-radius: 6px !important;
-        font-family: 'Poppins', sans-serif !important;
-    }
-
-    /* Result cards */
-    .result-card {
-        background-color: #161b22;
-        border: 1px solid #30363d;
-        border-radius: 10px;
-        padding: 15px 20px;
-        margin-bottom: 12px;
-        box-shadow: 0 0 10px rgba(88, 166, 255, 0.15);
-        transition: transform 0.2s ease-in-out;
-    }
-    .result-card:hover {
-        transform: scale(1.02);
-        box-shadow: 0 0 16px rgba(88, 166, 255, 0.3);
-    }
-
-    /* Highlighted query terms */
-    .highlight {
-        color: #ff79c6;
-        font-weight: 500;
-    }
-
-    /* Sidebar radio buttons */
-    .stRadio > label {
-        color: #f0f6fc !important;
-    }
-
-    /* Info caption */
-    .stCaption {
-        color: #8b949e;
-        font-style: italic;
-    }
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def _load_css():
+    """String CSS tema dibangun sekali per proses, lalu di-inject di setiap run"""
+    return """
+        <style>
+        @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
+
+        html, body, [class*="st-"], .stApp {
+            font-family: 'Poppins', sans-serif;
+            background-color: #0d1117;
+            color: #f0f6fc;
+        }
+
+        /* Sidebar styling */
+        section[data-testid="stSidebar"] {
+            background-color: #161b22;
+            color: #f0f6fc;
+            font-family: 'Poppins', sans-serif;
+        }
+
+        /* Headings */
+        h1, h2, h3, h4 {
+            color: #58a6ff;
+            font-weight: 600;
+        }
+
+        /* Buttons */
+        div.stButton > button {
+            background-color: #238636;
+            color: #fff;
+            border-radius: 8px;
+            border: none;
+            padding: 0.5em 1em;
+            font-weight: 600;
+            transition: all 0.3s ease-in-out;
+            font-family: 'Poppins', sans-serif;
+        }
+        div.stButton > button:hover {
+            background-color: #2ea043;
+            transform: scale(1.03);
+            box-shadow: 0 0 12px rgba(46, 160, 67, 0.5);
+        }
+
+        /* Text input and sliders */
+        input, textarea, .stSlider, .stSelectbox {
+            background-color: #161b22 !important;
+            color: #f0f6fc !important;
+            border: 1px solid #30363d !important;
+            border-radius: 6px !important;
+            font-family: 'Poppins', sans-serif !important;
+        }
+
+        /* Result cards */
+        .result-card {
+            background-color: #161b22;
+            border: 1px solid #30363d;
+            border-radius: 10px;
+            padding: 15px 20px;
+            margin-bottom: 12px;
+            box-shadow: 0 0 10px rgba(88, 166, 255, 0.15);
+            transition: transform 0.2s ease-in-out;
+        }
+        .result-card:hover {
+            transform: scale(1.02);
+            box-shadow: 0 0 16px rgba(88, 166, 255, 0.3);
+        }
+
+        /* Highlighted query terms */
+        .highlight {
+            color: #ff79c6;
+            font-weight: 500;
+        }
+
+        /* Sidebar radio buttons */
+        .stRadio > label {
+            color: #f0f6fc !important;
+        }
+
+        /* Info caption */
+        .stCaption {
+            color: #8b949e;
+            font-style: italic;
+        }
+        </style>
+    """
+
+st.markdown(_load_css(), unsafe_allow_html=True)
 
 # ============================================================
 # 🎛️ Sidebar Menu
@@ -111,22 +145,18 @@ def display_menu():
         ("Boolean Search", "VSM Search", "Compare Schemes", "Corpus Statistics")
     )
 
-# ============================================================
-# 🚀 Main Interface
-# ============================================================
-st.title("🔍 MINI SEARCH ENGINE - STKI PROJECT")
-st.caption("Yuk, intip review makanan enak hari ini 😋 Information Retrieval System — Boolean & Vector Space Model -")
-menu = display_menu()
-
 # ============================================================
 # 🧩 BOOLEAN SEARCH MODE
 # ============================================================
-if menu == "Boolean Search":
+# Setiap panel adalah st.fragment: klik "Cari" hanya menjalankan ulang
+# panel tersebut, bukan seluruh halaman (CSS, sidebar, judul).
+@st.fragment
+def boolean_panel():
     st.header("🔎 Boolean Search")
     query = st.text_input("Masukkan query (gunakan AND / OR / NOT):", "")
     if st.button("Cari"):
         if query.strip():
-            hasil = boolean_search(query)
+            hasil = _boolean_cached(query)
             st.subheader("📄 Hasil Pencarian:")
             if hasil:
                 for doc in hasil:
@@ -139,15 +169,17 @@ if menu == "Boolean Search":
 # ============================================================
 # 🧮 VSM SEARCH MODE
 # ============================================================
-elif menu == "VSM Search":
+@st.fragment
+def vsm_panel():
     st.header("📊 Vector Space Model (TF-IDF)")
     query = st.text_input("Masukkan kata kunci bebas:")
     top_k = st.slider("Jumlah hasil yang ditampilkan:", 3, 20, 5)
+    scheme = st.selectbox("Skema pembobotan TF-IDF:", ("standard", "sublinear", "bm25"))
     if st.button("Cari"):
         if query.strip():
-            hasil = vsm_search(query)
+            hasil = _vsm_cached(query, top_k, scheme)
             if hasil:
-                for r in hasil[:top_k]:
+                for r in hasil:
                     score = r.get('score', 0)
                     snippet = r.get('snippet', '')
                     st.markdown(
@@ -166,7 +198,8 @@ elif menu == "VSM Search":
 # ============================================================
 # ⚖️ COMPARE MODE
 # ============================================================
-elif menu == "Compare Schemes":
+@st.fragment
+def compare_panel():
     st.header("⚖️ Compare TF-IDF Schemes")
     st.write("Bandingkan performa TF-IDF Standard vs Sublinear berdasarkan truth set.")
 
@@ -182,7 +215,7 @@ elif menu == "Compare Schemes":
     if st.button("🔍 Jalankan Perbandingan"):
         with st.spinner("Sedang menjalankan evaluasi perbandingan..."):
             try:
-                hasil = compare_vsm_schemes(top_k=int(top_k), truth_set=None, verbose=False)
+                hasil = _compare_cached(int(top_k))
                 st.success("✅ Evaluasi selesai!")
                 st.dataframe(hasil, use_container_width=True)
 
@@ -194,22 +227,17 @@ elif menu == "Compare Schemes":
                 st.error(f"❌ Terjadi kesalahan: {str(e)}")
                 st.exception(e)
 
-# ============================================================
-# 📊 CORPUS STATS
-# ============================================================
-# ============================================================
-# 📊 CORPUS STATS
-# ============================================================
 # ============================================================
 # 📊 CORPUS STATISTICS MODE
 # ============================================================
-elif menu == "Corpus Statistics":
+@st.fragment
+def corpus_stats_panel():
     st.header("📚 Corpus Statistics")
     st.write("Lihat statistik dari corpus yang sudah diproses di sistem ini.")
 
     if st.button("Tampilkan Statistik Corpus"):
         try:
-            stats, df_docs = corpus_statistics()
+            stats, df_docs = _corpus_stats_cached()
 
             # Tampilkan metrik utama
             st.metric("Total Documents", stats["Total Documents"])
@@ -224,3 +252,18 @@ elif menu == "Corpus Statistics":
             st.error("❌ Terjadi kesalahan saat memuat statistik corpus.")
             st.exception(e)
 
+# ============================================================
+# 🚀 Main Interface
+# ============================================================
+st.title("🔍 MINI SEARCH ENGINE - STKI PROJECT")
+st.caption("Yuk, intip review makanan enak hari ini 😋 Information Retrieval System — Boolean & Vector Space Model -")
+menu = display_menu()
+
+if menu == "Boolean Search":
+    boolean_panel()
+elif menu == "VSM Search":
+    vsm_panel()
+elif menu == "Compare Schemes":
+    compare_panel()
+elif menu == "Corpus Statistics":
+    corpus_stats_panel()
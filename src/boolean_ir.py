@@ -1,56 +1,101 @@
 import os
-import pandas as pd
-from scipy.sparse import csr_matrix
+import sys
+import pickle
+import hashlib
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 import numpy as np
 
+# pandas & scipy hanya dipakai untuk laporan/evaluasi, jadi di-import
+# di dalam fungsi yang membutuhkannya (mempercepat import modul ini)
+
 # ==============================================================
 # 1️⃣ Load dokumen hasil preprocessing
 # ==============================================================
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 clean_path = os.path.join(BASE_DIR, "data", "processed")
+index_cache_path = os.path.join(clean_path, "index.pkl")
+
+# Naikkan versi ini jika struktur hasil build_index() berubah,
+# supaya pickle lama otomatis diabaikan
+_INDEX_VERSION = "7"
 
 # Cek apakah folder processed ada
+# (raise, bukan exit: di Streamlit exit() mematikan seluruh server)
 if not os.path.exists(clean_path):
-    print(f"❌ ERROR: Folder tidak ditemukan: {clean_path}")
-    print("⚠️  Jalankan 'python src/preprocess.py' terlebih dahulu!")
-    exit(1)
+    raise FileNotFoundError(
+        f"Folder tidak ditemukan: {clean_path}. "
+        "Jalankan 'python src/preprocess.py' terlebih dahulu!"
+    )
 
-documents = {}
-for file in sorted(os.listdir(clean_path)):
-    if file.endswith(".txt"):
-        with open(os.path.join(clean_path, file), "r", encoding="utf-8") as f:
-            documents[file] = f.read().split()
+def _read_tokens(file):
+    """Baca satu file hasil preprocessing, kembalikan (nama file, tokens)"""
+    with open(os.path.join(clean_path, file), "r", encoding="utf-8") as f:
+        # Intern token: term yang sama di semua dokumen berbagi satu objek str,
+        # sehingga hemat memori dan lookup dict/set cukup membandingkan pointer
+        return file, [sys.intern(t) for t in f.read().split()]
 
-# Cek apakah ada dokumen yang berhasil di-load
-if not documents:
-    print(f"❌ ERROR: Tidak ada file .txt di folder: {clean_path}")
-    print("⚠️  Pastikan preprocessing sudah dijalankan dengan benar!")
-    exit(1)
+def load_documents():
+    """
+    Baca semua file .txt hasil preprocessing
+    
+    Returns:
+        tuple: (documents, doc_sets), urut berdasarkan nama file
+        - documents: dict {doc_name: [tokens]} (urutan token, untuk snippet)
+        - doc_sets: dict {doc_name: frozenset(tokens)} (cek keanggotaan O(1))
+    """
+    files = [f for f in sorted(os.listdir(clean_path)) if f.endswith(".txt")]
+    
+    # Baca file secara paralel (I/O-bound); ex.map menjaga urutan nama file
+    docs, doc_sets = {}, {}
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for file, tokens in ex.map(_read_tokens, files):
+            docs[file] = tokens
+            doc_sets[file] = frozenset(tokens)
+    return docs, doc_sets
+
+def _corpus_signature():
+    """Hash nama file + mtime + ukuran, dipakai sebagai kunci cache index"""
+    h = hashlib.sha1(_INDEX_VERSION.encode())
+    for file in sorted(os.listdir(clean_path)):
+        if file.endswith(".txt"):
+            st = os.stat(os.path.join(clean_path, file))
+            h.update(f"{file}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return h.hexdigest()
 
 # ==============================================================
 # 2️⃣ Fungsi Build Inverted Index
 # ==============================================================
 
-def build_inverted_index(docs):
+def build_inverted_index(docs, doc_sets=None):
     """
     Bangun inverted index dari dokumen
     
     Args:
         docs: dict {doc_name: [tokens]}
+        doc_sets: dict {doc_name: frozenset(tokens)} (opsional, dihitung jika None)
     
     Returns:
         tuple: (inverted_index, vocabulary)
-        - inverted_index: dict {term: set(doc_names)}
-        - vocabulary: sorted list of unique terms
+        - inverted_index: dict {term: frozenset(doc_ids)}, doc_id = posisi
+          dokumen dalam sorted(docs) (sama dengan DOC_NAMES)
+        - vocabulary: sorted tuple of unique terms
     """
-    # Bangun vocabulary
-    vocab = sorted(set(term for tokens in docs.values() for term in tokens))
+    if doc_sets is None:
+        doc_sets = {doc: frozenset(tokens) for doc, tokens in docs.items()}
     
-    # Bangun inverted index
-    inv_idx = {}
-    for term in vocab:
-        inv_idx[term] = {doc for doc, tokens in docs.items() if term in tokens}
+    # Satu kali scan token unik: tiap dokumen menyumbang ke posting term-nya
+    postings = defaultdict(set)
+    for doc_id, doc in enumerate(sorted(docs)):
+        for term in doc_sets[doc]:
+            postings[term].add(doc_id)
+    
+    # Vocabulary urut, posting dibekukan (immutable setelah build)
+    vocab = tuple(sorted(postings))
+    inv_idx = {term: frozenset(postings[term]) for term in vocab}
     
     return inv_idx, vocab
 
@@ -62,25 +107,32 @@ def build_incidence_matrix(docs, vocab, inv_idx):
     """
     Bangun sparse incidence matrix (term x document)
     
+    Hanya untuk display/analisis; query Boolean dieksekusi langsung
+    dengan operasi himpunan pada posting list (lihat boolean_retrieval).
+    
     Args:
         docs: dict {doc_name: [tokens]}
-        vocab: sorted list of terms
-        inv_idx: inverted index dict
+        vocab: sorted tuple of terms
+        inv_idx: inverted index dict {term: frozenset(doc_ids)}
     
     Returns:
         scipy.sparse.csr_matrix: sparse incidence matrix
     """
-    incidence_data = []
-    doc_names = list(docs.keys())
+    n_docs = len(docs)
     
-    for term in vocab:
-        row = [1 if doc in inv_idx[term] else 0 for doc in doc_names]
-        incidence_data.append(row)
+    # Koordinat (term, doc_id) langsung dari posting, tanpa baris penuh berisi 0
+    rows, cols = [], []
+    for ti, term in enumerate(vocab):
+        for doc_id in inv_idx[term]:
+            rows.append(ti)
+            cols.append(doc_id)
     
-    # Konversi ke sparse matrix untuk efisiensi memori
-    sparse_matrix = csr_matrix(incidence_data)
+    # uint8 cukup untuk nilai 0/1 (8x lebih hemat dari int64)
+    data = np.ones(len(rows), dtype=np.uint8)
+    from scipy.sparse import csr_matrix
+    sparse_matrix = csr_matrix((data, (rows, cols)), shape=(len(vocab), n_docs))
     
-    print(f"✅ Sparse Incidence Matrix: {len(vocab)} terms x {len(doc_names)} docs")
+    print(f"✅ Sparse Incidence Matrix: {len(vocab)} terms x {n_docs} docs")
     
     total_elements = sparse_matrix.shape[0] * sparse_matrix.shape[1]
     if total_elements > 0:
@@ -91,19 +143,111 @@ def build_incidence_matrix(docs, vocab, inv_idx):
     
     return sparse_matrix
 
+def _build_display_df(sparse_matrix):
+    """
+    Bungkus incidence matrix menjadi DataFrame untuk display
+    
+    DataFrame tetap sparse (tanpa .toarray()); pandas baru di-import di sini.
+    """
+    import pandas as pd
+    return pd.DataFrame.sparse.from_spmatrix(
+        sparse_matrix,
+        index=list(vocabulary),
+        columns=list(DOC_NAMES)
+    )
+
 # ==============================================================
-# 4️⃣ Inisialisasi Global Variables
+# 4️⃣ Build Index (sekali per proses) & Inisialisasi Global Variables
 # ==============================================================
 
-inverted_index, vocabulary = build_inverted_index(documents)
-incidence_matrix_sparse = build_incidence_matrix(documents, vocabulary, inverted_index)
+@lru_cache(maxsize=None)
+def build_index():
+    """
+    Load dokumen lalu bangun inverted index.
+    
+    Hasil di-cache di memori (sekali per proses) dan di-pickle ke
+    data/processed/index.pkl. Selama file .txt tidak berubah, index
+    langsung dibaca dari pickle tanpa membaca ulang dokumen.
+    
+    Returns:
+        tuple: (documents, doc_sets, inverted_index, vocabulary)
+    """
+    signature = _corpus_signature()
+    
+    try:
+        with open(index_cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("signature") == signature:
+            return cached["index"]
+    except Exception:
+        # Pickle belum ada / rusak / format lama → bangun ulang
+        pass
+    
+    docs, doc_sets = load_documents()
+    inv_idx, vocab = build_inverted_index(docs, doc_sets)
+    index = (docs, doc_sets, inv_idx, vocab)
+    
+    try:
+        with open(index_cache_path, "wb") as f:
+            pickle.dump({"signature": signature, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # Folder read-only (mis. saat deploy): cukup pakai cache memori
+        pass
+    
+    return index
 
-# Untuk display purpose, buat DataFrame biasa (opsional)
-incidence_df = pd.DataFrame(
-    incidence_matrix_sparse.toarray(), 
-    index=vocabulary, 
-    columns=documents.keys()
-)
+documents, doc_sets, inverted_index, vocabulary = build_index()
+
+# Cek apakah ada dokumen yang berhasil di-load
+if not documents:
+    raise FileNotFoundError(
+        f"Tidak ada file .txt di folder: {clean_path}. "
+        "Pastikan preprocessing sudah dijalankan dengan benar!"
+    )
+
+# Mapping doc-id ↔ nama dokumen, dibangun sekali. Semua operasi index
+# memakai doc-id integer; nama hanya dipakai saat presentasi.
+DOC_NAMES = tuple(sorted(documents))
+DOC_ID = {name: i for i, name in enumerate(DOC_NAMES)}
+
+# Posting tiap term disimpan sebagai bitmap int Python: bit ke-d = dokumen
+# DOC_NAMES[d]. AND/OR/NOT menjadi operasi bitwise &, |, ^ dalam satu
+# instruksi per word, tanpa hashing string seperti pada set.
+def ids_to_bitmap(ids):
+    """Kumpulan doc-id → bitmap int"""
+    bm = 0
+    for i in ids:
+        bm |= 1 << i
+    return bm
+
+def bitmap_to_ids(bm):
+    """Bitmap int → list doc-id terurut (iterasi bit yang menyala saja)"""
+    ids = []
+    while bm:
+        low = bm & -bm
+        ids.append(low.bit_length() - 1)
+        bm ^= low
+    return ids
+
+def posting_size(bm):
+    """Jumlah dokumen dalam bitmap (popcount)"""
+    return bm.bit_count()
+
+def ids_to_names(bm):
+    """Konversi bitmap menjadi list nama dokumen (terurut)"""
+    return [DOC_NAMES[i] for i in bitmap_to_ids(bm)]
+
+def names_to_bitmap(names):
+    """Himpunan nama dokumen → bitmap (nama di luar korpus diabaikan)"""
+    return ids_to_bitmap(DOC_ID[name] for name in names if name in DOC_ID)
+
+term_bitmap = {term: ids_to_bitmap(ids) for term, ids in inverted_index.items()}
+
+# Semesta dokumen (untuk NOT): semua bit dokumen menyala
+UNIVERSE_MASK = (1 << len(DOC_NAMES)) - 1
+
+# Bitmap kosong untuk term di luar vocabulary (tanpa alokasi baru tiap miss)
+_EMPTY_BM = 0
 
 # ==============================================================
 # 5️⃣ Fungsi Evaluasi (Precision & Recall)
@@ -111,7 +255,10 @@ incidence_df = pd.DataFrame(
 
 def evaluate(query_result, relevant_docs):
     """
-    Hitung Precision dan Recall
+    Hitung Precision dan Recall untuk satu query
+    
+    Irisan retrieved ∩ relevan dihitung sekali dan dipakai untuk semua
+    metrik.
     
     Args:
         query_result: set of retrieved documents
@@ -120,10 +267,7 @@ def evaluate(query_result, relevant_docs):
     Returns:
         tuple: (precision, recall, f1)
     """
-    if not query_result:
-        return 0.0, 0.0, 0.0
-    
-    if not relevant_docs:
+    if not query_result or not relevant_docs:
         return 0.0, 0.0, 0.0
     
     true_positive = len(query_result & relevant_docs)
@@ -131,10 +275,7 @@ def evaluate(query_result, relevant_docs):
     recall = true_positive / len(relevant_docs)
     
     # Hitung F1-Score
-    if precision + recall > 0:
-        f1 = 2 * (precision * recall) / (precision + recall)
-    else:
-        f1 = 0.0
+    f1 = 2 * (precision * recall) / (precision + recall) if true_positive else 0.0
     
     return precision, recall, f1
 
@@ -148,26 +289,28 @@ def explain_set(op, set_a, set_b, term_a=None, term_b=None):
     
     Args:
         op: operator ("AND", "OR", "NOT")
-        set_a, set_b: set dokumen
+        set_a, set_b: bitmap dokumen (int)
         term_a, term_b: nama term (untuk logging)
     
     Returns:
-        set: hasil operasi
+        int: bitmap hasil operasi
     """
     if op == "AND":
         result = set_a & set_b
-        desc = f"'{term_a}' AND '{term_b}'" if term_a and term_b else "Intersection"
-        print(f"   └─ {desc} → {len(result)} docs: {sorted(result)}")
     elif op == "OR":
         result = set_a | set_b
-        desc = f"'{term_a}' OR '{term_b}'" if term_a and term_b else "Union"
-        print(f"   └─ {desc} → {len(result)} docs: {sorted(result)}")
     elif op == "NOT":
-        result = set_a - set_b
+        result = set_a & (UNIVERSE_MASK ^ set_b)
+    else:
+        return set_a
+    
+    if op == "NOT":
         desc = f"NOT '{term_b}'" if term_b else "Complement"
-        print(f"   └─ {desc} → {len(result)} docs: {sorted(result)}")
+    elif term_a and term_b:
+        desc = f"'{term_a}' {op} '{term_b}'"
     else:
-        result = set_a
+        desc = "Intersection" if op == "AND" else "Union"
+    print(f"   └─ {desc} → {posting_size(result)} docs: {ids_to_names(result)}")
     
     return result
 
@@ -175,10 +318,177 @@ def explain_set(op, set_a, set_b, term_a=None, term_b=None):
 # 7️⃣ Parser Query Boolean (Diperbaiki)
 # ==============================================================
 
+# Token operator di-intern: token query juga di-intern oleh _tokenize,
+# sehingga perbandingan == berhenti di cek identitas pointer
+_AND, _OR, _NOT = sys.intern("and"), sys.intern("or"), sys.intern("not")
+
+@lru_cache(maxsize=256)
+def _tokenize(query):
+    """Lowercase + split query (di-cache per string query), token di-intern"""
+    return tuple(sys.intern(token) for token in query.lower().split())
+
+# Opcode program RPN (postfix) hasil kompilasi query.
+# OP_JZ / OP_JU: lompat melewati operand kanan AND / OR jika operand kiri
+# sudah menentukan hasil (kosong untuk AND, semua dokumen untuk OR)
+OP_TERM, OP_AND, OP_OR, OP_NOT, OP_JZ, OP_JU = 0, 1, 2, 3, 4, 5
+
+# Prioritas operator biner: AND mengikat lebih kuat daripada OR.
+# NOT (prioritas tertinggi) langsung diterapkan ke term setelahnya.
+_PRECEDENCE = {OP_OR: 1, OP_AND: 2}
+_SHORT_CIRCUIT = {OP_AND: OP_JZ, OP_OR: OP_JU}
+
+@lru_cache(maxsize=512)
+def compile_query(query):
+    """
+    Kompilasi query Boolean menjadi program RPN (shunting-yard)
+    
+    Prioritas operator: NOT > AND > OR, operator biner asosiatif kiri.
+    Dua term tanpa operator di antaranya digabung dengan AND; operator
+    biner tanpa operand kiri/kanan diabaikan, dan jika beberapa operator
+    biner berurutan, yang terakhir yang berlaku. Setelah operand kiri
+    tiap operator biner disisipkan instruksi lompat (short-circuit).
+    Program di-cache per string query.
+    
+    Returns:
+        tuple: ((opcode, arg, term), ...); arg = bitmap untuk OP_TERM,
+        indeks tujuan untuk OP_JZ/OP_JU; term hanya terisi untuk OP_TERM
+    """
+    output = []
+    op_stack = []       # (operator, indeks instruksi lompat miliknya)
+    pending_op = None   # operator biner yang menunggu operand kanan
+    pending_not = 0     # jumlah NOT sebelum term berikutnya
+    has_left = False    # sudah ada operand di kiri
+    
+    def emit_operator():
+        # Tujuan lompat = instruksi setelah operator ini
+        op, jump_at = op_stack.pop()
+        output.append((op, None, None))
+        output[jump_at] = (_SHORT_CIRCUIT[op], len(output), None)
+    
+    for token in _tokenize(query):
+        if token == _AND or token == _OR:
+            if has_left:
+                pending_op = OP_AND if token == _AND else OP_OR
+        elif token == _NOT:
+            pending_not += 1
+        else:
+            if has_left:
+                op = OP_AND if pending_op is None else pending_op
+                while op_stack and _PRECEDENCE[op_stack[-1][0]] >= _PRECEDENCE[op]:
+                    emit_operator()
+                # Operand kiri sudah lengkap di output: sisipkan slot lompat
+                op_stack.append((op, len(output)))
+                output.append(None)
+            
+            output.append((OP_TERM, term_bitmap.get(token, _EMPTY_BM), token))
+            output.extend((OP_NOT, None, None) for _ in range(pending_not))
+            
+            pending_op = None
+            pending_not = 0
+            has_left = True
+    
+    while op_stack:
+        emit_operator()
+    
+    return tuple(output)
+
+def run_rpn(program):
+    """
+    Eksekusi program RPN dengan stack bitmap
+    
+    Returns:
+        int: bitmap dokumen hasil query (0 jika query tanpa term)
+    """
+    stack = []
+    pc = 0
+    n = len(program)
+    while pc < n:
+        opcode, arg, _ = program[pc]
+        pc += 1
+        if opcode == OP_TERM:
+            stack.append(arg)
+        elif opcode == OP_JZ:
+            # x AND ... dengan x kosong → hasil tetap kosong
+            if not stack[-1]:
+                pc = arg
+        elif opcode == OP_JU:
+            # x OR ... dengan x = semua dokumen → hasil tetap semua dokumen
+            if stack[-1] == UNIVERSE_MASK:
+                pc = arg
+        elif opcode == OP_NOT:
+            stack.append(UNIVERSE_MASK ^ stack.pop())
+        else:
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(a & b if opcode == OP_AND else a | b)
+    return stack[-1] if stack else 0
+
+def _explain_rpn(program):
+    """
+    Eksekusi program RPN sambil menjelaskan setiap langkah
+    
+    Returns:
+        int: bitmap dokumen, atau None jika query tanpa term
+    """
+    stack = []
+    labels = []
+    
+    # Explain menampilkan semua langkah, jadi instruksi lompat diabaikan
+    for opcode, bm, token in program:
+        if opcode == OP_JZ or opcode == OP_JU:
+            continue
+        if opcode == OP_TERM:
+            print(f"   Term: '{token}' → {posting_size(bm)} docs: {ids_to_names(bm)}")
+            stack.append(bm)
+            labels.append(token)
+        elif opcode == OP_NOT:
+            print(f"   Operator: NOT")
+            result = UNIVERSE_MASK ^ stack.pop()
+            print(f"   Setelah negasi: {posting_size(result)} docs: {ids_to_names(result)}")
+            stack.append(result)
+            labels.append(f"NOT {labels.pop()}")
+        else:
+            op = "AND" if opcode == OP_AND else "OR"
+            print(f"   Operator: {op}")
+            b, term_b = stack.pop(), labels.pop()
+            a, term_a = stack.pop(), labels.pop()
+            stack.append(explain_set(op, a, b, term_a, term_b))
+            labels.append(f"({term_a} {op} {term_b})")
+    
+    return stack[-1] if stack else None
+
+def batch_boolean(queries):
+    """
+    Evaluasi banyak query sekaligus tanpa explain
+    
+    Args:
+        queries: iterable string query
+    
+    Returns:
+        dict: {query: bitmap dokumen}
+    """
+    return {query: _query_bitmap(query) for query in queries}
+
+@lru_cache(maxsize=1024)
+def _query_bitmap(query):
+    """Bitmap hasil query (tanpa explain) di-cache; bitmap immutable setelah index dibangun"""
+    return run_rpn(compile_query(query))
+
+@lru_cache(maxsize=1024)
+def _retrieve(query):
+    """Nama dokumen hasil query (tanpa explain), di-cache per string query"""
+    return frozenset(ids_to_names(_query_bitmap(query)))
+
+def _explain_query(query):
+    """Eksekusi query dengan explain step-by-step, hasilnya bitmap dokumen"""
+    print(f"\n🔍 Processing query: '{query}'")
+    result = _explain_rpn(compile_query(query))
+    return result if result is not None else _EMPTY_BM
+
 def boolean_retrieval(query, verbose=True):
     """
     Parse dan eksekusi query Boolean sederhana
-    Mendukung: AND, OR, NOT
+    Mendukung: AND, OR, NOT (prioritas NOT > AND > OR)
     
     Args:
         query: string query (e.g., "term1 AND term2", "NOT term3")
@@ -187,62 +497,11 @@ def boolean_retrieval(query, verbose=True):
     Returns:
         set: dokumen yang memenuhi query
     """
-    tokens = query.lower().split()
-    result = None
-    current_op = None
-    negate_next = False
-    prev_term = None
-    
-    if verbose:
-        print(f"\n🔍 Processing query: '{query}'")
-    
-    for i, token in enumerate(tokens):
-        if token == "and":
-            current_op = "AND"
-            if verbose:
-                print(f"   Operator: AND")
-        elif token == "or":
-            current_op = "OR"
-            if verbose:
-                print(f"   Operator: OR")
-        elif token == "not":
-            negate_next = True
-            if verbose:
-                print(f"   Operator: NOT (negasi untuk term berikutnya)")
-        else:
-            # Token adalah term
-            docs_with_token = inverted_index.get(token, set())
-            current_term = token
-            
-            if verbose:
-                print(f"   Term: '{token}' → {len(docs_with_token)} docs: {sorted(docs_with_token)}")
-            
-            # Tangani negasi
-            if negate_next:
-                docs_with_token = set(documents.keys()) - docs_with_token
-                current_term = f"NOT {token}"
-                if verbose:
-                    print(f"   Setelah negasi: {len(docs_with_token)} docs: {sorted(docs_with_token)}")
-                negate_next = False
-            
-            # Inisialisasi result pertama kali
-            if result is None:
-                result = docs_with_token
-                prev_term = current_term
-            else:
-                # Operasi Boolean
-                if current_op == "AND":
-                    result = explain_set("AND", result, docs_with_token, prev_term, current_term) if verbose else result & docs_with_token
-                elif current_op == "OR":
-                    result = explain_set("OR", result, docs_with_token, prev_term, current_term) if verbose else result | docs_with_token
-                else:
-                    # Default ke AND jika tidak ada operator
-                    result = explain_set("AND", result, docs_with_token, prev_term, current_term) if verbose else result & docs_with_token
-                
-                prev_term = f"({prev_term} {current_op} {current_term})"
-                current_op = None
-    
-    return result if result is not None else set()
+    if not verbose:
+        return set(_retrieve(query))
+    
+    # Konversi bitmap ke nama dokumen hanya di akhir
+    return set(ids_to_names(_explain_query(query)))
 
 # ==============================================================
 # 8️⃣ Wrapper untuk Integrasi ke search_engine.py
@@ -292,6 +551,12 @@ truth_set = {
     "staff OR layan": {"doc6.txt", "doc8.txt", "doc9.txt", "doc10.txt"}
 }
 
+# Kolom tabel hasil evaluasi Boolean (urutan tetap, dipakai juga oleh eval.py)
+EVAL_COLUMNS = ['query', 'precision', 'recall', 'f1', 'retrieved', 'relevant', 'true_positive']
+
+# Gold standard dalam bentuk bitmap, dihitung sekali saat load
+truth_bitmaps = {query: names_to_bitmap(docs) for query, docs in truth_set.items()}
+
 # ==============================================================
 # 🔟 Testing & Evaluation
 # ==============================================================
@@ -309,15 +574,24 @@ def run_evaluation():
         print(f"Query: {query}")
         print(f"Gold Standard: {sorted(gold_docs)}")
         
-        # Retrieve
-        retrieved = boolean_retrieval(query, verbose=True)
+        # Retrieve (bitmap dokumen)
+        retrieved_bm = _explain_query(query)
         
-        # Evaluate
-        precision, recall, f1 = evaluate(retrieved, gold_docs)
+        # Evaluate: irisan dengan gold standard cukup satu AND + popcount
+        n_retrieved = retrieved_bm.bit_count()
+        n_relevant = len(gold_docs)
+        true_positive = (retrieved_bm & truth_bitmaps[query]).bit_count()
+        
+        if n_retrieved and n_relevant:
+            precision = true_positive / n_retrieved
+            recall = true_positive / n_relevant
+            f1 = 2 * precision * recall / (precision + recall) if true_positive else 0.0
+        else:
+            precision = recall = f1 = 0.0
         
         print(f"\n📈 Metrics:")
-        print(f"   Precision: {precision:.3f} ({len(retrieved & gold_docs)}/{len(retrieved)} relevan)")
-        print(f"   Recall:    {recall:.3f} ({len(retrieved & gold_docs)}/{len(gold_docs)} ditemukan)")
+        print(f"   Precision: {precision:.3f} ({true_positive}/{n_retrieved} relevan)")
+        print(f"   Recall:    {recall:.3f} ({true_positive}/{n_relevant} ditemukan)")
         print(f"   F1-Score:  {f1:.3f}")
         
         results.append({
@@ -325,16 +599,17 @@ def run_evaluation():
             'precision': precision,
             'recall': recall,
             'f1': f1,
-            'retrieved': len(retrieved),
-            'relevant': len(gold_docs),
-            'true_positive': len(retrieved & gold_docs)
+            'retrieved': n_retrieved,
+            'relevant': n_relevant,
+            'true_positive': true_positive
         })
     
     # Summary
     print(f"\n{'='*60}")
     print("📊 SUMMARY EVALUASI")
     print("="*60)
-    df_results = pd.DataFrame(results)
+    import pandas as pd
+    df_results = pd.DataFrame.from_records(results, columns=EVAL_COLUMNS)
     print(df_results.to_string(index=False))
     print(f"\n📌 Average Metrics:")
     print(f"   Precision: {df_results['precision'].mean():.3f}")
@@ -356,6 +631,9 @@ if __name__ == "__main__":
     print(f"   Documents: {len(documents)}")
     print(f"   Document list: {sorted(documents.keys())}")
     
+    # Incidence matrix hanya dibangun untuk laporan CLI
+    incidence_matrix_sparse = build_incidence_matrix(documents, vocabulary, inverted_index)
+    
     print(f"\n📊 Incidence Matrix (Sparse):")
     print(f"   Shape: {incidence_matrix_sparse.shape}")
     print(f"   Non-zero entries: {incidence_matrix_sparse.nnz}")
@@ -363,11 +641,12 @@ if __name__ == "__main__":
         print(f"   Sparsity: {(1 - incidence_matrix_sparse.nnz / (incidence_matrix_sparse.shape[0] * incidence_matrix_sparse.shape[1])) * 100:.2f}%")
     
     print(f"\n📋 Sample Incidence Matrix (first 10 terms):")
+    incidence_df = _build_display_df(incidence_matrix_sparse)
     print(incidence_df.head(10))
     
     print(f"\n🔍 Sample Inverted Index (first 5 terms):")
-    for i, (term, docs) in enumerate(list(inverted_index.items())[:5]):
-        print(f"   '{term}' → {sorted(docs)}")
+    for term, docs in islice(inverted_index.items(), 5):
+        print(f"   '{term}' → {[DOC_NAMES[i] for i in sorted(docs)]}")
     
     # Run evaluation
     results_df = run_evaluation()
@@ -8,9 +8,10 @@ from collections import defaultdict
 # Import dari modul yang sudah dibuat
 import sys, os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from boolean_ir import boolean_retrieval, truth_set as boolean_truth_set, evaluate as boolean_evaluate
-from vsm_ir import search_vsm, set_weighting_scheme, truth_set as vsm_truth_set
-from vsm_ir import precision_at_k, recall_at_k, average_precision, mean_average_precision
+from boolean_ir import truth_set as boolean_truth_set
+from boolean_ir import batch_boolean, names_to_bitmap, ids_to_names, EVAL_COLUMNS as BOOL_EVAL_COLUMNS
+from vsm_ir import search_vsm_batch, set_weighting_scheme, truth_set as vsm_truth_set
+from vsm_ir import precision_at_k, recall_at_k, average_precision, mean_average_precision, as_doc_set
 
 # =========================================================
 # 📊 EVALUATION METRICS (Tambahan untuk Boolean)
@@ -23,6 +24,17 @@ def f1_score(precision, recall):
     return 2 * (precision * recall) / (precision + recall)
 
 
+# Faktor diskon DCG 1/log2(rank + 1) untuk rank 1.._MAX_K, dihitung sekali
+_MAX_K = 1024
+_LOG2_RECIP = 1.0 / np.log2(np.arange(2, _MAX_K + 2))
+
+def _dcg_discounts(n):
+    """Faktor diskon untuk n rank teratas (dihitung langsung jika n > _MAX_K)"""
+    if n <= _MAX_K:
+        return _LOG2_RECIP[:n]
+    return 1.0 / np.log2(np.arange(2, n + 2))
+
+
 def ndcg_at_k(retrieved_docs, relevant_docs, k):
     """
     Hitung nDCG@k (Normalized Discounted Cumulative Gain)
@@ -37,25 +49,34 @@ def ndcg_at_k(retrieved_docs, relevant_docs, k):
     """
     # Pastikan k adalah integer
     k = int(k) if k else 5
+    relevant_docs = as_doc_set(relevant_docs)
     
     # Handle jika retrieved_docs adalah list of dicts (dari VSM)
     if retrieved_docs and isinstance(retrieved_docs[0], dict):
         retrieved_docs = [r['doc_id'] for r in retrieved_docs]
     
-    # Hitung DCG@k
-    dcg = 0.0
-    for i, doc in enumerate(retrieved_docs[:k]):
-        if doc in relevant_docs:
-            # Relevance = 1 jika relevan, 0 jika tidak
-            dcg += 1.0 / np.log2(i + 2)  # i+2 karena rank dimulai dari 1
+    # Hitung DCG@k: relevance = 1 jika relevan, 0 jika tidak
+    top_k = retrieved_docs[:k]
+    hits = np.fromiter((doc in relevant_docs for doc in top_k), dtype=np.float64, count=len(top_k))
+    dcg = float(hits @ _dcg_discounts(hits.size))
     
     # Hitung IDCG@k (ideal DCG)
-    idcg = sum(1.0 / np.log2(i + 2) for i in range(min(k, len(relevant_docs))))
+    idcg = float(_dcg_discounts(min(k, len(relevant_docs))).sum())
     
     # nDCG = DCG / IDCG
     return dcg / idcg if idcg > 0 else 0.0
 
 
+def _vsm_eval_columns(top_k):
+    """Kolom tabel hasil evaluasi VSM untuk cutoff top_k"""
+    return ['query', f'P@{top_k}', f'R@{top_k}', f'F1@{top_k}', 'AP', f'nDCG@{top_k}', 'retrieved', 'relevant']
+
+
+def _column_means(df, columns):
+    """Rata-rata beberapa kolom metrik sekaligus (satu reduksi NumPy, tanpa Series per kolom)"""
+    return df[list(columns)].to_numpy(dtype=np.float64).mean(axis=0)
+
+
 # =========================================================
 # 🔍 EVALUASI BOOLEAN RETRIEVAL
 # =========================================================
@@ -81,20 +102,30 @@ def evaluate_boolean_model(truth_set=None, verbose=True):
     
     results = []
     
+    # Semua query dievaluasi sekaligus sebagai bitmap dokumen;
+    # metrik cukup dihitung dari popcount irisan bitmap
+    retrieved_all = batch_boolean(truth_set)
+    
     for query, gold_docs in truth_set.items():
         if verbose:
             print(f"\n{'─'*70}")
             print(f"Query: '{query}'")
             print(f"Gold Standard ({len(gold_docs)} docs): {sorted(gold_docs)}")
         
-        # Retrieve
-        retrieved = boolean_retrieval(query, verbose=False)
+        retrieved_bm = retrieved_all[query]
+        n_retrieved = retrieved_bm.bit_count()
+        n_relevant = len(gold_docs)
+        true_positive = (retrieved_bm & names_to_bitmap(gold_docs)).bit_count()
         
-        # Evaluate
-        precision, recall, f1 = boolean_evaluate(retrieved, gold_docs)
+        if n_retrieved and n_relevant:
+            precision = true_positive / n_retrieved
+            recall = true_positive / n_relevant
+        else:
+            precision = recall = 0.0
+        f1 = f1_score(precision, recall)
         
         if verbose:
-            print(f"Retrieved ({len(retrieved)} docs): {sorted(retrieved)}")
+            print(f"Retrieved ({n_retrieved} docs): {ids_to_names(retrieved_bm)}")
             print(f"\n📈 Metrics:")
             print(f"   Precision: {precision:.3f}")
             print(f"   Recall:    {recall:.3f}")
@@ -105,22 +136,23 @@ def evaluate_boolean_model(truth_set=None, verbose=True):
             'precision': precision,
             'recall': recall,
             'f1': f1,
-            'retrieved': len(retrieved),
-            'relevant': len(gold_docs),
-            'true_positive': len(retrieved & gold_docs)
+            'retrieved': n_retrieved,
+            'relevant': n_relevant,
+            'true_positive': true_positive
         })
     
-    df_results = pd.DataFrame(results)
+    df_results = pd.DataFrame.from_records(results, columns=BOOL_EVAL_COLUMNS)
     
     if verbose:
         print(f"\n{'='*70}")
         print("📊 SUMMARY - BOOLEAN RETRIEVAL")
         print("="*70)
         print(df_results.to_string(index=False))
+        mean_p, mean_r, mean_f1 = _column_means(df_results, ('precision', 'recall', 'f1'))
         print(f"\n📌 Average Metrics:")
-        print(f"   Precision: {df_results['precision'].mean():.3f}")
-        print(f"   Recall:    {df_results['recall'].mean():.3f}")
-        print(f"   F1-Score:  {df_results['f1'].mean():.3f}")
+        print(f"   Precision: {mean_p:.3f}")
+        print(f"   Recall:    {mean_r:.3f}")
+        print(f"   F1-Score:  {mean_f1:.3f}")
         print("="*70)
     
     return df_results
@@ -150,14 +182,15 @@ def evaluate_vsm_model(weighting="standard", top_k=5, truth_set=None, verbose=Tr
         truth_set = vsm_truth_set
     
     # Set weighting scheme
-    set_weighting_scheme(weighting)
+    set_weighting_scheme(weighting, verbose=verbose)
     
     if verbose:
         print("\n" + "="*70)
         print(f"📊 EVALUASI MODEL: VSM - {weighting.upper()}")
         print("="*70)
     
-    results_dict = {}
+    # Retrieve top-k untuk semua query sekaligus (satu perkalian matrix)
+    results_dict = search_vsm_batch(truth_set, top_k=top_k, verbose=False)
     eval_results = []
     
     for query, relevant_docs in truth_set.items():
@@ -166,9 +199,7 @@ def evaluate_vsm_model(weighting="standard", top_k=5, truth_set=None, verbose=Tr
             print(f"Query: '{query}'")
             print(f"Gold Standard ({len(relevant_docs)} docs): {sorted(relevant_docs)}")
         
-        # Retrieve top-k
-        retrieved = search_vsm(query, top_k=top_k, verbose=False)
-        results_dict[query] = retrieved
+        retrieved = results_dict[query]
         
         # Hitung metrics
         prec_k = precision_at_k(retrieved, relevant_docs, top_k)
@@ -201,19 +232,22 @@ def evaluate_vsm_model(weighting="standard", top_k=5, truth_set=None, verbose=Tr
     # Hitung MAP
     map_score = mean_average_precision(results_dict, truth_set)
     
-    df_results = pd.DataFrame(eval_results)
+    df_results = pd.DataFrame.from_records(eval_results, columns=_vsm_eval_columns(top_k))
     
     if verbose:
         print(f"\n{'='*70}")
         print(f"📊 SUMMARY - VSM {weighting.upper()}")
         print("="*70)
         print(df_results.to_string(index=False))
+        mean_p, mean_r, mean_f1, mean_ndcg = _column_means(
+            df_results, (f'P@{top_k}', f'R@{top_k}', f'F1@{top_k}', f'nDCG@{top_k}')
+        )
         print(f"\n📌 Average Metrics:")
-        print(f"   Mean Precision@{top_k}: {df_results[f'P@{top_k}'].mean():.3f}")
-        print(f"   Mean Recall@{top_k}:    {df_results[f'R@{top_k}'].mean():.3f}")
-        print(f"   Mean F1@{top_k}:        {df_results[f'F1@{top_k}'].mean():.3f}")
+        print(f"   Mean Precision@{top_k}: {mean_p:.3f}")
+        print(f"   Mean Recall@{top_k}:    {mean_r:.3f}")
+        print(f"   Mean F1@{top_k}:        {mean_f1:.3f}")
         print(f"   MAP@{top_k}:            {map_score:.3f}")
-        print(f"   Mean nDCG@{top_k}:      {df_results[f'nDCG@{top_k}'].mean():.3f}")
+        print(f"   Mean nDCG@{top_k}:      {mean_ndcg:.3f}")
         print("="*70)
     
     return df_results, map_score
@@ -254,6 +288,11 @@ def compare_vsm_schemes(top_k=5, truth_set=None, verbose=False):
     results_std, map_std = evaluate_vsm_model("standard", top_k, truth_set, verbose=False)
     results_sub, map_sub = evaluate_vsm_model("sublinear", top_k, truth_set, verbose=False)
     
+    # Rata-rata metrik per skema: P, R, F1, nDCG
+    metric_cols = (f'P@{top_k}', f'R@{top_k}', f'F1@{top_k}', f'nDCG@{top_k}')
+    p_std, r_std, f1_std, ndcg_std = _column_means(results_std, metric_cols)
+    p_sub, r_sub, f1_sub, ndcg_sub = _column_means(results_sub, metric_cols)
+    
     # Comparison table
     comparison_df = pd.DataFrame({
         'Metric': [
@@ -263,20 +302,8 @@ def compare_vsm_schemes(top_k=5, truth_set=None, verbose=False):
             f'MAP@{top_k}',
             f'Mean nDCG@{top_k}'
         ],
-        'Standard': [
-            results_std[f'P@{top_k}'].mean(),
-            results_std[f'R@{top_k}'].mean(),
-            results_std[f'F1@{top_k}'].mean(),
-            map_std,
-            results_std[f'nDCG@{top_k}'].mean()
-        ],
-        'Sublinear': [
-            results_sub[f'P@{top_k}'].mean(),
-            results_sub[f'R@{top_k}'].mean(),
-            results_sub[f'F1@{top_k}'].mean(),
-            map_sub,
-            results_sub[f'nDCG@{top_k}'].mean()
-        ]
+        'Standard': [p_std, r_std, f1_std, map_std, ndcg_std],
+        'Sublinear': [p_sub, r_sub, f1_sub, map_sub, ndcg_sub]
     })
     
     # Tambahkan kolom delta & improvement
@@ -373,23 +400,17 @@ def evaluate_all_models(top_k=5, verbose=True):
     print("📊 OVERALL SUMMARY")
     print("="*70)
     
+    # Rata-rata (Precision, Recall, F1) per model
+    vsm_cols = (f'P@{top_k}', f'R@{top_k}', f'F1@{top_k}')
+    bool_means = _column_means(df_bool, ('precision', 'recall', 'f1'))
+    std_means = _column_means(df_vsm_std, vsm_cols)
+    sub_means = _column_means(df_vsm_sub, vsm_cols)
+    
     summary = pd.DataFrame({
         'Model': ['Boolean', 'VSM Standard', 'VSM Sublinear'],
-        'Precision': [
-            df_bool['precision'].mean(),
-            df_vsm_std[f'P@{top_k}'].mean(),
-            df_vsm_sub[f'P@{top_k}'].mean()
-        ],
-        'Recall': [
-            df_bool['recall'].mean(),
-            df_vsm_std[f'R@{top_k}'].mean(),
-            df_vsm_sub[f'R@{top_k}'].mean()
-        ],
-        'F1': [
-            df_bool['f1'].mean(),
-            df_vsm_std[f'F1@{top_k}'].mean(),
-            df_vsm_sub[f'F1@{top_k}'].mean()
-        ],
+        'Precision': [bool_means[0], std_means[0], sub_means[0]],
+        'Recall': [bool_means[1], std_means[1], sub_means[1]],
+        'F1': [bool_means[2], std_means[2], sub_means[2]],
         'MAP': [
             '-',  # Boolean tidak pakai MAP
             f"{map_std:.3f}",
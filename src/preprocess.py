@@ -1,7 +1,8 @@
 import os
+import sys
 import string
-import re
 import json
+import numpy as np
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
 from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
@@ -11,7 +12,9 @@ from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFacto
 
 stemmer = StemmerFactory().create_stemmer()
 stop_factory = StopWordRemoverFactory()
-stopwords = set(stop_factory.get_stop_words())
+# frozenset string ter-intern: token hasil tokenize() juga di-intern,
+# sehingga lookup stopword yang cocok berhenti di cek identitas
+stopwords = frozenset(sys.intern(w) for w in stop_factory.get_stop_words())
 
 # Ambil folder utama proyek
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -21,28 +24,74 @@ input_path = os.path.join(BASE_DIR, "data", "raw")
 output_path = os.path.join(BASE_DIR, "data", "processed")
 os.makedirs(output_path, exist_ok=True)
 
+# Buffer baca/tulis file (64 KB)
+IO_BUFFER = 65536
+
 # ==============================================================
 # Fungsi-fungsi preprocessing
 # ==============================================================
 
+# Satu tabel translate: angka → spasi (agar kata tidak menyambung),
+# tanda baca dihapus. Dibangun sekali, bukan di setiap panggilan clean()
+_CLEAN_TABLE = str.maketrans(string.digits, " " * len(string.digits), string.punctuation)
+
 def clean(text):
     """Case folding, hapus angka dan tanda baca."""
-    text = text.lower()
-    text = re.sub(r'\d+', ' ', text)  # hapus angka
-    text = text.translate(str.maketrans("", "", string.punctuation))  # hapus tanda baca
-    return text
+    return text.lower().translate(_CLEAN_TABLE)
 
 def tokenize(text):
     """Pisahkan teks jadi token (list kata)."""
-    return text.split()
+    return [sys.intern(t) for t in text.split()]
 
 def remove_stopwords(tokens):
     """Hilangkan stopwords Bahasa Indonesia."""
     return [t for t in tokens if t not in stopwords]
 
+# Cache hasil stemming per bentuk kata, dipakai bersama untuk seluruh korpus
+_STEM_CACHE = {}
+
 def stem(tokens):
-    """Lakukan stemming ke bentuk dasar."""
-    return [stemmer.stem(t) for t in tokens]
+    """Lakukan stemming ke bentuk dasar (tiap kata unik cukup di-stem sekali)."""
+    stemmed = []
+    for t in tokens:
+        root = _STEM_CACHE.get(t)
+        if root is None:
+            root = _STEM_CACHE[t] = stemmer.stem(t)
+        stemmed.append(root)
+    return stemmed
+
+def preprocess_file(in_file, out_file):
+    """
+    Jalankan seluruh tahapan preprocessing untuk satu file dan simpan hasilnya.
+    
+    Returns:
+        tuple: (original_chars, tokens_after_tokenize, tokens_after_stopword,
+                final_tokens, unique_tokens)
+    """
+    with open(in_file, "r", encoding="utf-8", buffering=IO_BUFFER) as f:
+        text = f.read()
+
+    # Tahapan sesuai rubrik
+    original_length = len(text)
+    
+    cleaned = clean(text)
+    tokens = tokenize(cleaned)
+    tokens_before_filter = len(tokens)
+    
+    filtered = remove_stopwords(tokens)
+    tokens_after_filter = len(filtered)
+    
+    stemmed = stem(filtered)
+    final_tokens = len(stemmed)
+    unique_tokens = len(set(stemmed))
+
+    final_text = " ".join(stemmed)
+
+    # Simpan hasil
+    with open(out_file, "w", encoding="utf-8", buffering=IO_BUFFER) as f:
+        f.write(final_text)
+    
+    return original_length, tokens_before_filter, tokens_after_filter, final_tokens, unique_tokens
 
 # ==============================================================
 # Main process
@@ -56,56 +105,82 @@ print("="*60)
 print("🔄 MEMULAI PREPROCESSING DOKUMEN")
 print("="*60)
 
-# List untuk menyimpan statistik
-processing_stats = []
+# Statistik run sebelumnya (dari log JSON) untuk build inkremental:
+# file yang output-nya lebih baru dari input tidak diproses ulang.
+# Jalankan dengan --force untuk memproses ulang semua file.
+log_file = os.path.join(output_path, "preprocessing_log.json")
+previous_stats = {}
+if "--force" not in sys.argv and os.path.exists(log_file):
+    try:
+        with open(log_file, "r", encoding="utf-8") as f:
+            previous_stats = {s['filename']: s for s in json.load(f)['files']}
+    except (ValueError, KeyError, TypeError):
+        # Log rusak / format lama → proses ulang semua file
+        previous_stats = {}
+
+# Statistik disimpan per kolom (satu list per metrik), bukan dict per file
 files_processed = []
+original_chars = []
+tokens_after_tokenize = []
+tokens_after_stopword = []
+final_token_counts = []
+unique_token_counts = []
+reduction_rates = []
+files_skipped = 0
 
 for filename in os.listdir(input_path):
     if filename.endswith(".txt"):
-        with open(os.path.join(input_path, filename), "r", encoding="utf-8") as f:
-            text = f.read()
-
-        # Tahapan sesuai rubrik
-        original_length = len(text)
-        
-        cleaned = clean(text)
-        tokens = tokenize(cleaned)
-        tokens_before_filter = len(tokens)
-        
-        filtered = remove_stopwords(tokens)
-        tokens_after_filter = len(filtered)
+        in_file = os.path.join(input_path, filename)
+        out_file = os.path.join(output_path, filename)
+        cached = previous_stats.get(filename)
         
-        stemmed = stem(filtered)
-        final_tokens = len(stemmed)
-        unique_tokens = len(set(stemmed))
-
-        final_text = " ".join(stemmed)
-
-        # Simpan hasil
-        with open(os.path.join(output_path, filename), "w", encoding="utf-8") as f:
-            f.write(final_text)
+        if (cached is not None and os.path.exists(out_file)
+                and os.path.getmtime(out_file) >= os.path.getmtime(in_file)):
+            # Input tidak berubah sejak run terakhir: pakai statistik lama
+            original_length = cached['original_chars']
+            tokens_before_filter = cached['tokens_after_tokenize']
+            tokens_after_filter = cached['tokens_after_stopword']
+            final_tokens = cached['final_tokens']
+            unique_tokens = cached['unique_tokens']
+            files_skipped += 1
+            status = "♻️ "
+        else:
+            (original_length, tokens_before_filter, tokens_after_filter,
+             final_tokens, unique_tokens) = preprocess_file(in_file, out_file)
+            status = "✅"
 
         # Simpan statistik
-        stats = {
-            'filename': filename,
-            'original_chars': original_length,
-            'tokens_after_tokenize': tokens_before_filter,
-            'tokens_after_stopword': tokens_after_filter,
-            'final_tokens': final_tokens,
-            'unique_tokens': unique_tokens,
-            'stopwords_removed': tokens_before_filter - tokens_after_filter,
-            'reduction_rate': round((1 - final_tokens/tokens_before_filter) * 100, 2) if tokens_before_filter > 0 else 0
-        }
-        processing_stats.append(stats)
         files_processed.append(filename)
+        original_chars.append(original_length)
+        tokens_after_tokenize.append(tokens_before_filter)
+        tokens_after_stopword.append(tokens_after_filter)
+        final_token_counts.append(final_tokens)
+        unique_token_counts.append(unique_tokens)
+        reduction_rates.append(round((1 - final_tokens/tokens_before_filter) * 100, 2) if tokens_before_filter > 0 else 0)
 
-        print(f"✅ {filename:<20} | Original: {original_length:>6} chars | Final: {final_tokens:>4} tokens | Unique: {unique_tokens:>4}")
+        print(f"{status} {filename:<20} | Original: {original_length:>6} chars | Final: {final_tokens:>4} tokens | Unique: {unique_tokens:>4}")
 
 # ==============================================================
 # Simpan Log Ringkas ke JSON
 # ==============================================================
 
-log_file = os.path.join(output_path, "preprocessing_log.json")
+processing_stats = [
+    {
+        'filename': filename,
+        'original_chars': orig,
+        'tokens_after_tokenize': tok,
+        'tokens_after_stopword': after_sw,
+        'final_tokens': final,
+        'unique_tokens': uniq,
+        'stopwords_removed': tok - after_sw,
+        'reduction_rate': rate
+    }
+    for filename, orig, tok, after_sw, final, uniq, rate in zip(
+        files_processed, original_chars, tokens_after_tokenize,
+        tokens_after_stopword, final_token_counts, unique_token_counts, reduction_rates
+    )
+]
+
 with open(log_file, "w", encoding="utf-8") as f:
     json.dump({
         'summary': {
@@ -121,15 +196,18 @@ print("\n" + "="*60)
 print("📊 PREPROCESSING SUMMARY")
 print("="*60)
 print(f"✅ Total dokumen diproses  : {len(files_processed)}")
+if files_skipped:
+    print(f"♻️  Tidak berubah (skip)    : {files_skipped}")
 print(f"📁 Input folder            : {input_path}")
 print(f"📁 Output folder           : {output_path}")
 print(f"📄 Log file                : {log_file}")
 
-if processing_stats:
-    total_original = sum(s['original_chars'] for s in processing_stats)
-    total_final = sum(s['final_tokens'] for s in processing_stats)
-    total_unique = sum(s['unique_tokens'] for s in processing_stats)
-    avg_reduction = sum(s['reduction_rate'] for s in processing_stats) / len(processing_stats)
+if files_processed:
+    # Agregasi per kolom: satu reduksi NumPy per metrik
+    total_original = np.asarray(original_chars, dtype=np.int64).sum()
+    total_final = np.asarray(final_token_counts, dtype=np.int64).sum()
+    total_unique = np.asarray(unique_token_counts, dtype=np.int64).sum()
+    avg_reduction = np.asarray(reduction_rates, dtype=np.float64).mean()
     
     print(f"\n📈 Statistik Agregat:")
     print(f"   Total karakter original : {total_original:,}")
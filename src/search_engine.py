@@ -1,38 +1,14 @@
 # src/search_engine.py
 
 import argparse
+from itertools import islice
 import sys
 import os
 import pandas as pd
 # Import dari modul yang sudah dibuat
 from boolean_ir import boolean_retrieval, documents as bool_docs
-from vsm_ir import search_vsm, set_weighting_scheme, documents, vocabulary
-
-def corpus_statistics():
-    """
-    Tampilkan statistik corpus yang sudah di-load
-    
-    Returns:
-        dict: informasi corpus
-    """
-    stats = {
-        'total_documents': len(documents),
-        'vocabulary_size': len(vocabulary),
-        'document_list': sorted(documents.keys()),
-        'avg_doc_length': sum(len(doc) for doc in documents.values()) / len(documents) if documents else 0
-    }
-    
-    print(f"\n{'='*70}")
-    print(f"📚 CORPUS STATISTICS")
-    print(f"{'='*70}")
-    print(f"Total Documents    : {stats['total_documents']}")
-    print(f"Vocabulary Size    : {stats['vocabulary_size']} unique terms")
-    print(f"Avg Document Length: {stats['avg_doc_length']:.1f} terms")
-    print(f"Document List      : {', '.join(stats['document_list'][:5])}...")
-    print(f"{'='*70}")
-    
-    return stats
-
+# vsm_ir di-import di dalam fungsi yang memakainya: pencarian Boolean
+# tidak perlu memuat korpus & statistik VSM sama sekali
 
 # =========================================================
 # 🔍 SEARCH ENGINE ORCHESTRATOR
@@ -76,7 +52,7 @@ def run_vsm_search(query, top_k=5, weighting="standard", verbose=True):
     Args:
         query (str): free text query
         top_k (int): jumlah top documents
-        weighting (str): "standard" atau "sublinear"
+        weighting (str): "standard", "sublinear", atau "bm25"
         verbose (bool): tampilkan detail hasil
     
     Returns:
@@ -90,6 +66,8 @@ def run_vsm_search(query, top_k=5, weighting="standard", verbose=True):
     print(f"Weighting Scheme: {weighting.upper()}")
     print(f"{'─'*70}")
     
+    from vsm_ir import search_vsm, set_weighting_scheme, doc_token_sets, doc_term_counts
+    
     # Set weighting scheme sesuai parameter
     set_weighting_scheme(weighting)
     
@@ -107,14 +85,17 @@ def run_vsm_search(query, top_k=5, weighting="standard", verbose=True):
             
             # Tambahan: Top terms yang berkontribusi
             doc_name = r['doc_id']
-            if doc_name in documents:
-                doc_tokens = documents[doc_name]
+            if doc_name in doc_token_sets:
+                doc_terms = doc_token_sets[doc_name]
                 query_tokens = set(query.lower().split())
                 
-                # Ambil term yang ada di query DAN di dokumen
-                matching_terms = [t for t in query_tokens if t in doc_tokens]
-                if matching_terms:
-                    print(f"   🔑 Matching terms: {', '.join(matching_terms[:5])}")
+                # Ambil term yang ada di query DAN di dokumen, beserta TF-nya
+                # (set & Counter per dokumen dari korpus VSM, dihitung saat load)
+                doc_tf = doc_term_counts[doc_name]
+                term_freq = {t: doc_tf[t] for t in query_tokens if t in doc_terms}
+                if term_freq:
+                    top_terms = sorted(term_freq.items(), key=lambda x: x[1], reverse=True)[:5]
+                    print(f"   🔑 Matching terms: {', '.join(f'{t} ({tf}x)' for t, tf in top_terms)}")
     else:
         print(f"\n⚠️  Tidak ada dokumen relevan ditemukan")
     
@@ -123,10 +104,13 @@ def run_vsm_search(query, top_k=5, weighting="standard", verbose=True):
     return results
 
 
-def compare_weighting_schemes(query, top_k=5):
+def compare_query_schemes(query, top_k=5):
     """
     Bandingkan 2 skema weighting untuk query yang sama
     
+    Perbandingan per query (ranking berdampingan); evaluasi skema terhadap
+    truth set ada di vsm_ir.compare_weighting_schemes().
+    
     Args:
         query (str): query string
         top_k (int): jumlah top documents
@@ -138,6 +122,8 @@ def compare_weighting_schemes(query, top_k=5):
     print(f"Comparing: TF-IDF Standard vs TF-IDF Sublinear")
     print(f"{'='*70}")
     
+    from vsm_ir import search_vsm, set_weighting_scheme
+    
     schemes = ["standard", "sublinear"]
     all_results = {}
     
@@ -185,6 +171,9 @@ Examples:
   # VSM with sublinear weighting
   python search_engine.py --model vsm --query "kopi enak" --k 5 --weighting sublinear
   
+  # VSM with BM25 weighting
+  python search_engine.py --model vsm --query "kopi enak" --k 5 --weighting bm25
+  
   # Compare weighting schemes
   python search_engine.py --model vsm --query "ayam enak" --k 3 --compare
   
@@ -214,9 +203,9 @@ Examples:
     
     parser.add_argument(
         "--weighting", 
-        choices=["standard", "sublinear"], 
+        choices=["standard", "sublinear", "bm25"], 
         default="standard",
-        help="Weighting scheme untuk VSM: 'standard' atau 'sublinear' (default: standard)"
+        help="Weighting scheme untuk VSM: 'standard', 'sublinear', atau 'bm25' (default: standard)"
     )
     
     parser.add_argument(
@@ -231,6 +220,8 @@ Examples:
     # DEMO MODE - Jika tidak ada argumen
     # =========================================================
     if not args.model and not args.query:
+        from vsm_ir import documents, vocabulary
+        
         print("\n" + "="*70)
         print("🎬 DEMO MODE - MINI SEARCH ENGINE STKI")
         print("="*70)
@@ -283,7 +274,7 @@ Examples:
     elif args.model == "vsm":
         if args.compare:
             # Mode comparison
-            compare_weighting_schemes(args.query, top_k=args.k)
+            compare_query_schemes(args.query, top_k=args.k)
         else:
             # Mode normal
             run_vsm_search(args.query, top_k=args.k, weighting=args.weighting, verbose=True)
@@ -297,22 +288,24 @@ def corpus_statistics():
     Tampilkan statistik corpus yang sudah di-load, 
     dan kembalikan sebagai dict + DataFrame untuk Streamlit.
     """
+    from vsm_ir import documents, vocabulary, total_tokens
+    
     stats = {
         'Total Documents': len(documents),
         'Vocabulary Size': len(vocabulary),
-        'Average Doc Length': sum(len(doc) for doc in documents.values()) / len(documents) if documents else 0,
+        'Average Doc Length': total_tokens / len(documents) if documents else 0,
     }
 
     # Siapkan DataFrame daftar dokumen (misal: 5 pertama)
     doc_data = []
-    for doc_id, tokens in list(documents.items())[:10]:  # ambil 10 dokumen pertama
+    for doc_id, tokens in islice(documents.items(), 10):  # ambil 10 dokumen pertama
         doc_data.append({
             'Document ID': doc_id,
             'Token Count': len(tokens),
             'Preview': ' '.join(tokens[:15]) + ('...' if len(tokens) > 15 else '')
         })
 
-    df_docs = pd.DataFrame(doc_data)
+    df_docs = pd.DataFrame.from_records(doc_data, columns=['Document ID', 'Token Count', 'Preview'])
 
     # Print ke terminal juga (opsional)
     print(f"\n{'='*70}")
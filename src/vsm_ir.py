@@ -2,9 +2,8 @@ import os
 import numpy as np
 import pandas as pd
 from collections import Counter
-from math import log10
-from scipy.sparse import csr_matrix
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+from scipy.sparse import csr_matrix, vstack
 
 # ==============================================================  
 # 1️⃣ Load dokumen hasil preprocessing
@@ -14,45 +13,136 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 clean_path = os.path.join(BASE_DIR, "data", "processed")
 
 # Cek apakah folder processed ada
+# (raise, bukan exit: di Streamlit exit() mematikan seluruh server)
 if not os.path.exists(clean_path):
-    print(f"❌ ERROR: Folder tidak ditemukan: {clean_path}")
-    print("⚠️  Jalankan 'python src/preprocess.py' terlebih dahulu!")
-    exit(1)
+    raise FileNotFoundError(
+        f"Folder tidak ditemukan: {clean_path}. "
+        "Jalankan 'python src/preprocess.py' terlebih dahulu!"
+    )
 
 documents = {}
 for file in sorted(os.listdir(clean_path)):
     if file.endswith(".txt"):
         with open(os.path.join(clean_path, file), "r", encoding="utf-8") as f:
-            documents[file] = f.read().split()
+            documents[file] = tuple(f.read().split())
 
 if not documents:
-    print(f"❌ ERROR: Tidak ada file .txt di folder: {clean_path}")
-    exit(1)
+    raise FileNotFoundError(f"Tidak ada file .txt di folder: {clean_path}")
 
 filenames = list(documents.keys())
 N = len(documents)
 
+# Total token korpus, dihitung sekali saat load (dipakai statistik korpus)
+total_tokens = sum(map(len, documents.values()))
+
+# Snippet hasil pencarian (maksimal 120 karakter) dibangun sekali per dokumen
+SNIPPET_CHARS = 120
+
+def _make_snippet(tokens):
+    full_text = " ".join(tokens)
+    snippet = full_text[:SNIPPET_CHARS].replace("\n", " ")
+    if len(full_text) > SNIPPET_CHARS:
+        snippet += "..."
+    return snippet
+
+doc_snippets = {name: _make_snippet(tokens) for name, tokens in documents.items()}
+
 # ==============================================================  
 # 2️⃣ Vocabulary, DF, dan IDF
 # ==============================================================
 
-vocabulary = sorted(set(term for tokens in documents.values() for term in tokens))
-vocab_idx = {term: idx for idx, term in enumerate(vocabulary)}
+# TF per dokumen (Counter) dan himpunan term unik per dokumen (membership
+# O(1), dipakai DF & vocabulary), keduanya dibangun sekali saat load
+doc_term_counts = {name: Counter(tokens) for name, tokens in documents.items()}
+doc_token_sets = {name: frozenset(counts) for name, counts in doc_term_counts.items()}
 
-# Document Frequency (DF)
-df = {term: sum(1 for tokens in documents.values() if term in tokens) for term in vocabulary}
-
-# Inverse Document Frequency (IDF)
-idf = {term: log10(N / df[term]) if df[term] > 0 else 0.0 for term in vocabulary}
+vocabulary = tuple(sorted(frozenset().union(*doc_token_sets.values())))
+vocab_idx = {term: idx for idx, term in enumerate(vocabulary)}
 
-print(f"📊 Vocabulary: {len(vocabulary)} unique terms")
-print(f"📚 Documents: {N}")
+def _flatten_tokens(docs, term_idx):
+    """
+    Token seluruh dokumen sebagai satu array id term + indptr (layout CSR)
+    
+    Token dokumen ke-i ada di ids[indptr[i]:indptr[i+1]]; token yang tidak
+    ada di term_idx dibuang.
+    
+    Returns:
+        tuple: (ids int32, indptr int64)
+    """
+    doc_ids = [[term_idx[t] for t in tokens if t in term_idx] for tokens in docs.values()]
+    indptr = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in doc_ids], out=indptr[1:])
+    ids = np.fromiter((j for ids in doc_ids for j in ids), dtype=np.int32, count=indptr[-1])
+    return ids, indptr
+
+# Token korpus sebagai array id term (4 byte per token, bukan objek string),
+# dibangun sekali saat load dan dipakai ulang oleh builder TF-IDF tiap skema
+token_ids, token_indptr = _flatten_tokens(documents, vocab_idx)
+
+# Document Frequency (DF): satu pass, tiap dokumen menyumbang term uniknya
+df = Counter()
+for terms in doc_token_sets.values():
+    df.update(terms)
+
+# Inverse Document Frequency (IDF), array sejajar dengan vocabulary
+# (setiap term di vocabulary muncul minimal di satu dokumen, jadi df > 0)
+df_arr = np.fromiter((df[term] for term in vocabulary), dtype=np.float64, count=len(vocabulary))
+idf_arr = np.log10(N / df_arr)
+idf = dict(zip(vocabulary, idf_arr.tolist()))
 
 # ==============================================================  
 # 3️⃣ SKEMA 1: TF-IDF Standard
 # ==============================================================
 
-def compute_tfidf_standard(docs, vocab, idf_dict):
+def _build_tfidf(docs, vocab, idf_dict, tf_weight, flat_tokens=None):
+    """
+    Rakit TF-IDF sparse matrix dari array token-id datar (tanpa loop per term)
+    
+    Pasangan (dokumen, term) dihitung dengan np.unique dan seluruh bobot
+    dihitung dalam satu operasi array. Hanya term yang muncul di dokumen
+    yang disimpan, tanpa baris sepanjang vocabulary yang sebagian besar 0.
+    
+    Args:
+        tf_weight: fungsi (array count, array panjang dokumen) → array bobot
+            TF (count selalu > 0)
+        flat_tokens: (ids, indptr) hasil _flatten_tokens(docs, vocab) yang
+            sudah ada (mis. token_ids/token_indptr modul ini); None = dibangun
+            dari docs & vocab
+    
+    Returns:
+        scipy.sparse.csr_matrix: sparse TF-IDF matrix
+    """
+    n_docs, n_terms = len(docs), len(vocab)
+    idf_vec = np.fromiter((idf_dict[term] for term in vocab), dtype=np.float64, count=n_terms)
+    
+    # Token datar + indptr per dokumen (layout CSR)
+    if flat_tokens is None:
+        flat_tokens = _flatten_tokens(docs, {term: j for j, term in enumerate(vocab)})
+    ids, indptr = flat_tokens
+    rows = np.repeat(np.arange(n_docs, dtype=np.int64), np.diff(indptr))
+    
+    # Hitung kemunculan tiap pasangan (dokumen, term) sekaligus
+    keys, counts = np.unique(rows * n_terms + ids, return_counts=True)
+    rows, cols = np.divmod(keys, n_terms)
+    doc_lengths = np.diff(indptr)[rows]
+    weights = tf_weight(counts, doc_lengths) * idf_vec[cols]
+    
+    # Bobot 0 (term dengan IDF 0) tidak disimpan, sama seperti matrix dense
+    keep = weights != 0
+    return csr_matrix(
+        (weights[keep], (rows[keep].astype(np.int32), cols[keep].astype(np.int32))),
+        shape=(n_docs, n_terms)
+    )
+
+def raw_tf(counts, doc_lengths=None):
+    """TF standard: raw count (sebagai float64)"""
+    return counts.astype(np.float64)
+
+def sublinear_tf(counts, doc_lengths=None):
+    """TF sublinear: 1 + log10(count), dihitung untuk seluruh array sekaligus (count > 0)"""
+    return 1 + np.log10(counts)
+
+def compute_tfidf_standard(docs, vocab, idf_dict, flat_tokens=None):
     """
     Hitung TF-IDF matrix dengan skema STANDARD
     TF = raw count
@@ -60,20 +150,13 @@ def compute_tfidf_standard(docs, vocab, idf_dict):
     Returns:
         scipy.sparse.csr_matrix: sparse TF-IDF matrix
     """
-    tfidf_data = []
-    
-    for tokens in docs.values():
-        tf = Counter(tokens)
-        doc_vec = [tf.get(term, 0) * idf_dict[term] for term in vocab]
-        tfidf_data.append(doc_vec)
-    
-    return csr_matrix(tfidf_data)
+    return _build_tfidf(docs, vocab, idf_dict, raw_tf, flat_tokens)
 
 # ==============================================================  
 # 4️⃣ SKEMA 2: TF-IDF Sublinear (Log-scaled TF)
 # ==============================================================
 
-def compute_tfidf_sublinear(docs, vocab, idf_dict):
+def compute_tfidf_sublinear(docs, vocab, idf_dict, flat_tokens=None):
     """
     Hitung TF-IDF matrix dengan skema SUBLINEAR
     TF = 1 + log10(count) jika count > 0, else 0
@@ -83,48 +166,200 @@ def compute_tfidf_sublinear(docs, vocab, idf_dict):
     Returns:
         scipy.sparse.csr_matrix: sparse TF-IDF matrix
     """
-    tfidf_data = []
+    # Sublinear scaling: 1 + log(tf) (hanya term dengan tf > 0 yang dikunjungi)
+    return _build_tfidf(docs, vocab, idf_dict, sublinear_tf, flat_tokens)
+
+# ==============================================================  
+# 📐 SKEMA 3: BM25 (TF saturasi + normalisasi panjang dokumen)
+# ==============================================================
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def compute_bm25(docs, vocab, idf_dict, k1=BM25_K1, b=BM25_B, flat_tokens=None):
+    """
+    Hitung matrix bobot dokumen BM25
+    w = IDF × count·(k1 + 1) / (count + k1·(1 − b + b·|d| / avgdl))
+    
+    Normalisasi panjang sudah ada di bobot, jadi skor query cukup dot
+    product (tanpa cosine). b=0 memberi TF saturasi tanpa efek panjang.
+    
+    Returns:
+        scipy.sparse.csr_matrix: sparse BM25 matrix
+    """
+    avg_len = sum(map(len, docs.values())) / len(docs) if docs else 0
     
-    for tokens in docs.values():
-        tf = Counter(tokens)
-        doc_vec = []
-        for term in vocab:
-            count = tf.get(term, 0)
-            # Sublinear scaling: 1 + log(tf) jika tf > 0
-            tf_scaled = (1 + log10(count)) if count > 0 else 0
-            doc_vec.append(tf_scaled * idf_dict[term])
-        tfidf_data.append(doc_vec)
+    def bm25_tf(counts, doc_lengths):
+        length_norm = 1 - b + b * doc_lengths / avg_len if avg_len else 1.0
+        return counts * (k1 + 1) / (counts + k1 * length_norm)
     
-    return csr_matrix(tfidf_data)
+    return _build_tfidf(docs, vocab, idf_dict, bm25_tf, flat_tokens)
 
 # ==============================================================  
 # 5️⃣ Global variable untuk TF-IDF matrix (akan di-switch)
 # ==============================================================
 
-# Default: gunakan standard
-tfidf_matrix = compute_tfidf_standard(documents, vocabulary, idf)
+# Matrix tiap skema dihitung sekali saat pertama dipakai, lalu di-cache;
+# ganti skema cukup menukar referensi matrix aktif
+_TFIDF_BUILDERS = {
+    "standard": compute_tfidf_standard,
+    "sublinear": compute_tfidf_sublinear,
+    "bm25": compute_bm25,
+}
+
+# Skema yang skornya dot product langsung, bukan cosine similarity
+DOT_PRODUCT_SCHEMES = frozenset({"bm25"})
+_tfidf_cache = {}
+
+def get_tfidf_matrix(scheme="standard"):
+    """
+    Ambil TF-IDF matrix untuk skema tertentu (memoized per skema)
+    
+    Args:
+        scheme: "standard", "sublinear", atau "bm25"
+    
+    Returns:
+        scipy.sparse.csr_matrix: sparse TF-IDF matrix
+    """
+    matrix = _tfidf_cache.get(scheme)
+    if matrix is None:
+        matrix = _tfidf_cache[scheme] = _TFIDF_BUILDERS[scheme](
+            documents, vocabulary, idf, flat_tokens=(token_ids, token_indptr)
+        )
+    return matrix
+
+# Matrix untuk scoring disimpan float32: setengah memori & bandwidth
+# dibanding float64, presisinya (~7 digit) jauh melebihi skor yang
+# ditampilkan (4 desimal). Normalisasi tetap dihitung di float64.
+SCORE_DTYPE = np.float32
+
+def l2_normalize_rows(matrix):
+    """
+    Normalisasi L2 tiap baris sparse matrix (baris bernorma 0 tetap 0)
+    
+    Cukup bagi array data CSR dengan norma barisnya; tidak ada
+    validasi/konversi tambahan seperti pada sklearn.preprocessing.normalize.
+    
+    Returns:
+        scipy.sparse.csr_matrix: salinan matrix dengan tiap baris ber-norma 1 (atau 0)
+    """
+    unit = csr_matrix(matrix, copy=True)
+    norms = np.sqrt(np.asarray(unit.multiply(unit).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    unit.data /= np.repeat(norms, np.diff(unit.indptr))
+    return unit
+
+_tfidf_norm_cache = {}
+
+def get_normalized_tfidf(scheme="standard"):
+    """
+    TF-IDF matrix dengan baris ter-normalisasi L2 (memoized per skema)
+    
+    Dokumen statis, jadi norma baris cukup dihitung sekali per skema;
+    cosine similarity per query tinggal satu perkalian sparse. Skema di
+    DOT_PRODUCT_SCHEMES (BM25) tidak dinormalisasi.
+    
+    Returns:
+        scipy.sparse.csr_matrix: matrix SCORE_DTYPE dengan tiap baris ber-norma 1 (atau 0)
+    """
+    matrix = _tfidf_norm_cache.get(scheme)
+    if matrix is None:
+        unit = get_tfidf_matrix(scheme)
+        if scheme not in DOT_PRODUCT_SCHEMES:
+            unit = l2_normalize_rows(unit)
+        matrix = _tfidf_norm_cache[scheme] = unit.astype(SCORE_DTYPE)
+    return matrix
+
+# Korpus kecil (N x |V| sel tidak lebih dari batas ini): scoring memakai
+# salinan dense dari matrix ter-normalisasi, karena untuk matrix kecil
+# overhead sparse (indptr/indices, alokasi hasil sparse) lebih mahal
+# daripada perkalian dense biasa
+DENSE_MAX_CELLS = 4_000_000
+
+_doc_matrix_T_cache = {}
+
+def _doc_matrix_T(scheme):
+    """
+    Transpose (|V| x N) dari matrix TF-IDF ter-normalisasi (memoized per skema)
+    
+    Baris ke-j adalah posting list term j: dokumen yang memuat term
+    tersebut beserta bobotnya. Query dengan beberapa term cukup membaca
+    baris-baris itu saja, dokumen tanpa term query tidak pernah disentuh.
+    Korpus kecil disimpan dense (ndarray contiguous), korpus besar
+    sebagai inverted index CSR.
+    """
+    matrix_T = _doc_matrix_T_cache.get(scheme)
+    if matrix_T is None:
+        matrix_T = get_normalized_tfidf(scheme).T.tocsr()
+        if N * len(vocabulary) <= DENSE_MAX_CELLS:
+            matrix_T = np.ascontiguousarray(matrix_T.toarray())
+        _doc_matrix_T_cache[scheme] = matrix_T
+    return matrix_T
+
+def _cosine_scores(scheme, q_units):
+    """
+    Cosine similarity semua dokumen terhadap query yang sudah ter-normalisasi
+    (dot product untuk skema di DOT_PRODUCT_SCHEMES)
+    
+    Args:
+        q_units: csr_matrix Q x |V| dari _query_units()
+    
+    Returns:
+        np.ndarray: skor dense N x Q
+    """
+    # sparse (Q x |V|) @ (|V| x N): akumulasi skor per posting list term query
+    scores = q_units @ _doc_matrix_T(scheme)
+    if not isinstance(scores, np.ndarray):
+        # Dokumen di luar posting list tetap mendapat skor 0
+        scores = scores.toarray()
+    return scores.T
+
+# Default: gunakan standard. Matrix tidak dibangun saat import; ranking
+# mengambilnya lewat get_normalized_tfidf(), dan set_weighting_scheme()
+# mengisi tfidf_matrix saat skema pertama kali dipilih
+tfidf_matrix = None
 current_scheme = "standard"
 
-def set_weighting_scheme(scheme="standard"):
+def _ensure_matrix():
+    """Pastikan tfidf_matrix terisi matrix skema aktif (dibangun saat pertama dipakai)"""
+    global tfidf_matrix
+    if tfidf_matrix is None:
+        tfidf_matrix = get_tfidf_matrix(current_scheme)
+    return tfidf_matrix
+
+def set_weighting_scheme(scheme="standard", verbose=True):
     """
     Switch antara skema weighting
     
     Args:
-        scheme: "standard" atau "sublinear"
+        scheme: "standard", "sublinear", atau "bm25"
+        verbose: tampilkan skema aktif & statistik matrix (skema tidak
+            dikenal selalu dilaporkan)
     """
     global tfidf_matrix, current_scheme
     
     if scheme == "standard":
-        tfidf_matrix = compute_tfidf_standard(documents, vocabulary, idf)
+        tfidf_matrix = get_tfidf_matrix("standard")
         current_scheme = "standard"
-        print(f"✅ Using TF-IDF Standard")
+        label = "TF-IDF Standard"
     elif scheme == "sublinear":
-        tfidf_matrix = compute_tfidf_sublinear(documents, vocabulary, idf)
+        tfidf_matrix = get_tfidf_matrix("sublinear")
         current_scheme = "sublinear"
-        print(f"✅ Using TF-IDF Sublinear (log-scaled)")
+        label = "TF-IDF Sublinear (log-scaled)"
+    elif scheme == "bm25":
+        tfidf_matrix = get_tfidf_matrix("bm25")
+        current_scheme = "bm25"
+        label = f"BM25 (k1={BM25_K1}, b={BM25_B})"
     else:
         print(f"❌ Unknown scheme: {scheme}")
+        _ensure_matrix()
+        label = None
     
+    if not verbose:
+        return
+    
+    if label is not None:
+        print(f"✅ Using {label}")
     print(f"   Matrix shape: {tfidf_matrix.shape}")
     print(f"   Non-zero: {tfidf_matrix.nnz}")
     print(f"   Sparsity: {(1 - tfidf_matrix.nnz / (tfidf_matrix.shape[0] * tfidf_matrix.shape[1])) * 100:.2f}%")
@@ -133,78 +368,166 @@ def set_weighting_scheme(scheme="standard"):
 # 6️⃣ Fungsi Query Processing
 # ==============================================================
 
+@lru_cache(maxsize=256)
+def _query_term_counts(query):
+    """
+    Id term query (OOV dibuang) beserta TF-nya, di-cache per string query
+    
+    Tidak bergantung pada skema, jadi query yang sama di skema lain
+    (mis. evaluasi truth set per skema) tidak di-tokenize ulang.
+    
+    Returns:
+        tuple: (cols, counts) array read-only, cols terurut naik
+    """
+    tokens = query.lower().split()
+    
+    # Token → id term, lalu hitung TF sekaligus dengan np.unique
+    ids = np.fromiter((vocab_idx[t] for t in tokens if t in vocab_idx), dtype=np.int32)
+    cols, counts = np.unique(ids, return_counts=True)
+    cols.flags.writeable = False
+    counts.flags.writeable = False
+    return cols, counts
+
 def process_query(query, scheme="standard"):
     """
     Convert query string menjadi TF-IDF vector
     
+    Hanya term query yang ada di vocabulary yang disimpan (sparse 1 x |V|),
+    bukan array sepanjang vocabulary.
+    
     Args:
         query (str): query string
-        scheme (str): "standard" atau "sublinear"
+        scheme (str): "standard", "sublinear", atau "bm25"
     
     Returns:
-        np.array: TF-IDF vector untuk query
+        scipy.sparse.csr_matrix: TF-IDF vector untuk query, shape (1, |V|);
+        untuk BM25 berisi TF query saja (IDF sudah ada di bobot dokumen)
     """
-    tokens = query.lower().split()
-    tf = Counter(tokens)
+    cols, counts = _query_term_counts(query)
     
-    if scheme == "sublinear":
-        q_vec = np.array([
-            ((1 + log10(tf.get(term, 0))) if tf.get(term, 0) > 0 else 0) * idf.get(term, 0.0) 
-            for term in vocabulary
-        ])
-    else:  # standard
-        q_vec = np.array([tf.get(term, 0) * idf.get(term, 0.0) for term in vocabulary])
+    if scheme == "bm25":
+        weights = raw_tf(counts)
+    else:
+        tf_weight = sublinear_tf if scheme == "sublinear" else raw_tf
+        weights = tf_weight(counts) * idf_arr[cols]
     
-    return q_vec
+    # Term dengan IDF 0 tidak berkontribusi (sama seperti vector dense)
+    keep = weights != 0
+    cols = cols[keep]
+    return csr_matrix(
+        (weights[keep], (np.zeros(cols.size, dtype=np.int32), cols)),
+        shape=(1, len(vocabulary))
+    )
 
 # ==============================================================  
 # 7️⃣ VSM Search dengan Cosine Similarity
 # ==============================================================
 
-def search_vsm(query, top_k=5, verbose=True):
+def _query_units(scheme, q_vecs):
     """
-    Search menggunakan Vector Space Model
+    Query vector siap scoring: L2-normalisasi untuk cosine, apa adanya untuk BM25
     
-    Args:
-        query (str): query string
-        top_k (int): jumlah top documents yang dikembalikan
-        verbose (bool): tampilkan detail proses
+    Hasil di-cast ke SCORE_DTYPE (sama dengan matrix dokumen), supaya
+    perkalian tidak meng-upcast & menyalin matrix dokumen ke float64.
+    """
+    if scheme not in DOT_PRODUCT_SCHEMES:
+        q_vecs = l2_normalize_rows(q_vecs)
+    return q_vecs.astype(SCORE_DTYPE)
+
+def top_k_indices(scores, k):
+    """
+    Indeks k skor tertinggi, urut menurun (tie → indeks dokumen lebih kecil dulu)
+    
+    Memakai np.partition untuk mencari ambang skor ke-k (O(N)), lalu hanya
+    kandidat di atas ambang yang diurutkan, bukan seluruh N skor.
     
     Returns:
-        list: list of dict dengan doc_id, score, snippet
+        np.ndarray: indeks dokumen hasil ranking
     """
-    if verbose:
-        print(f"\n🔍 Query: '{query}' (scheme: {current_scheme})")
+    n = scores.size
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(n)
     
-    # Process query ke TF-IDF vector (sesuai current scheme)
-    q_vec = process_query(query, scheme=current_scheme).reshape(1, -1)
+    # Urutkan kandidat: skor menurun, lalu indeks menaik (sama seperti sort stabil)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
 
-    if np.all(q_vec == 0):
-        print("⚠️ Query tidak ada di vocabulary. Tidak bisa dihitung similarity.")
-        return []
+@lru_cache(maxsize=256)
+def _rank_documents(scheme, query, top_k):
+    """
+    Ranking top-k dokumen untuk query pada skema tertentu
+    
+    Hasil deterministik untuk (scheme, query, top_k) karena matrix tiap
+    skema tidak berubah setelah dibangun, jadi di-cache per kombinasi.
+    
+    Returns:
+        tuple: ((doc_index, score), ...), atau None jika query tidak ada di vocabulary
+    """
+    # Process query ke TF-IDF vector (sesuai scheme)
+    q_vec = process_query(query, scheme=scheme)
+    
+    if q_vec.nnz == 0:
+        return None
     
-    # Hitung cosine similarity
-    cos_sim = cosine_similarity(tfidf_matrix, q_vec).flatten()
+    # Cosine similarity = dot product vektor yang sudah ter-normalisasi
+    q_unit = _query_units(scheme, q_vec)
+    cos_sim = _cosine_scores(scheme, q_unit).ravel()
     
     # Ranking berdasarkan cosine similarity (descending)
-    ranked_idx = np.argsort(-cos_sim)[:top_k]
+    ranked_idx = top_k_indices(cos_sim, top_k)
+    return tuple((idx, cos_sim[idx]) for idx in ranked_idx)
+
+def _rank_batch(scheme, queries, top_k):
+    """
+    Ranking top-k untuk banyak query sekaligus
+    
+    Seluruh query vector ditumpuk jadi satu matrix Q x |V|, lalu cosine
+    similarity semua query dihitung dengan satu perkalian sparse
+    (N x |V|) @ (|V| x Q), bukan Q perkalian terpisah.
+    
+    Returns:
+        dict: {query: ((doc_index, score), ...) atau None}
+    """
+    if not queries:
+        return {}
+    
+    q_vecs = [process_query(query, scheme=scheme) for query in queries]
+    q_units = _query_units(scheme, vstack(q_vecs, format="csr"))
+    sims = _cosine_scores(scheme, q_units)  # N x Q
+    
+    ranked = {}
+    for j, (query, q_vec) in enumerate(zip(queries, q_vecs)):
+        if q_vec.nnz == 0:
+            ranked[query] = None
+            continue
+        cos_sim = sims[:, j]
+        ranked[query] = tuple((idx, cos_sim[idx]) for idx in top_k_indices(cos_sim, top_k))
+    return ranked
+
+def _format_results(query, ranked, verbose, scheme=None):
+    """Ubah hasil ranking (doc_index, score) jadi list dict hasil pencarian"""
+    if verbose:
+        print(f"\n🔍 Query: '{query}' (scheme: {scheme or current_scheme})")
+    
+    if ranked is None:
+        print("⚠️ Query tidak ada di vocabulary. Tidak bisa dihitung similarity.")
+        return []
     
     results = []
-    for rank, idx in enumerate(ranked_idx, 1):
+    for rank, (idx, score) in enumerate(ranked, 1):
         doc_id = filenames[idx]
-        score = cos_sim[idx]
-        
-        # Snippet maksimal 120 karakter
-        full_text = " ".join(documents[doc_id])
-        snippet = full_text[:120].replace("\n", " ")
-        if len(full_text) > 120:
-            snippet += "..."
-        
         results.append({
             "rank": rank,
             "doc_id": doc_id,
             "score": score,
-            "snippet": snippet
+            "snippet": doc_snippets[doc_id]
         })
         
         if verbose:
@@ -212,12 +535,52 @@ def search_vsm(query, top_k=5, verbose=True):
     
     return results
 
+def search_vsm(query, top_k=5, verbose=True):
+    """
+    Search menggunakan Vector Space Model
+    
+    Args:
+        query (str): query string
+        top_k (int): jumlah top documents yang dikembalikan
+        verbose (bool): tampilkan detail proses
+    
+    Returns:
+        list: list of dict dengan doc_id, score, snippet
+    """
+    _ensure_matrix()
+    
+    # Ranking (sesuai current scheme), di-cache per (scheme, query, top_k)
+    ranked = _rank_documents(current_scheme, query, top_k)
+    return _format_results(query, ranked, verbose)
+
+def search_vsm_batch(queries, top_k=5, verbose=False):
+    """
+    Search banyak query sekaligus (satu perkalian matrix untuk semua query)
+    
+    Args:
+        queries (iterable): daftar query string
+        top_k (int): jumlah top documents per query
+        verbose (bool): tampilkan hasil per query
+    
+    Returns:
+        dict: {query: list of dict dengan doc_id, score, snippet}
+    """
+    _ensure_matrix()
+    queries = list(dict.fromkeys(queries))
+    ranked = _rank_batch(current_scheme, queries, top_k)
+    return {query: _format_results(query, ranked[query], verbose) for query in queries}
+
 # ==============================================================  
 # 8️⃣ Evaluasi: Precision@k, Recall@k, MAP@k
 # ==============================================================
 
+def as_doc_set(docs):
+    """Pastikan himpunan dokumen relevan berupa set (lookup O(1)), bukan list/tuple"""
+    return docs if isinstance(docs, (set, frozenset)) else frozenset(docs)
+
 def precision_at_k(retrieved, relevant, k):
     """Hitung Precision@k"""
+    relevant = as_doc_set(relevant)
     retrieved_k = set([r['doc_id'] for r in retrieved[:k]])
     if not retrieved_k:
         return 0.0
@@ -225,6 +588,7 @@ def precision_at_k(retrieved, relevant, k):
 
 def recall_at_k(retrieved, relevant, k):
     """Hitung Recall@k"""
+    relevant = as_doc_set(relevant)
     retrieved_k = set([r['doc_id'] for r in retrieved[:k]])
     if not relevant:
         return 0.0
@@ -236,6 +600,7 @@ def average_precision(retrieved, relevant):
     
     AP = (sum of P@k for each relevant doc) / total relevant docs
     """
+    relevant = as_doc_set(relevant)
     if not relevant:
         return 0.0
     
@@ -312,6 +677,9 @@ def run_evaluation(top_k=5, verbose=False):
     results_dict = {}
     eval_results = []
     
+    # Ranking seluruh query truth set dalam satu perkalian matrix
+    ranked = _rank_batch(current_scheme, list(truth_set), top_k)
+    
     for query, relevant_docs in truth_set.items():
         if verbose:
             print(f"\n{'─'*60}")
@@ -319,7 +687,7 @@ def run_evaluation(top_k=5, verbose=False):
             print(f"Gold Standard ({len(relevant_docs)} docs): {sorted(relevant_docs)}")
         
         # Retrieve top-k
-        retrieved = search_vsm(query, top_k=top_k, verbose=verbose)
+        retrieved = _format_results(query, ranked[query], verbose)
         results_dict[query] = retrieved
         
         # Hitung metrics
@@ -345,7 +713,9 @@ def run_evaluation(top_k=5, verbose=False):
     # Hitung MAP
     map_score = mean_average_precision(results_dict, truth_set)
     
-    df_results = pd.DataFrame(eval_results)
+    df_results = pd.DataFrame.from_records(
+        eval_results, columns=['query', f'P@{top_k}', f'R@{top_k}', 'AP', 'retrieved', 'relevant']
+    )
     
     if verbose:
         # Summary
@@ -381,14 +751,14 @@ def compare_weighting_schemes(top_k=5):
     print("\n" + "─"*70)
     print("📊 EVALUASI SKEMA 1: TF-IDF STANDARD")
     print("─"*70)
-    set_weighting_scheme("standard")
+    set_weighting_scheme("standard", verbose=False)
     results_std, map_std = run_evaluation(top_k=top_k, verbose=True)
     
     # Evaluasi Skema 2: Sublinear
     print("\n" + "─"*70)
     print("📊 EVALUASI SKEMA 2: TF-IDF SUBLINEAR")
     print("─"*70)
-    set_weighting_scheme("sublinear")
+    set_weighting_scheme("sublinear", verbose=False)
     results_sub, map_sub = run_evaluation(top_k=top_k, verbose=True)
     
     # Comparison Summary
@@ -444,7 +814,7 @@ def compare_weighting_schemes(top_k=5):
     print("="*70)
     
     # Reset ke standard untuk konsistensi
-    set_weighting_scheme("standard")
+    set_weighting_scheme("standard", verbose=False)
     
     return comparison_df
 
@@ -452,12 +822,32 @@ def compare_weighting_schemes(top_k=5):
 # 1️⃣1️⃣ Wrapper untuk Integrasi ke search_engine.py
 # ==============================================================
 
-def vsm_search(query, k=5):
-    """Wrapper function untuk dipanggil dari search_engine.py"""
+def vsm_search(query, k=5, scheme=None, verbose=True):
+    """
+    Wrapper function untuk dipanggil dari search_engine.py
+    
+    Skema dipilih per panggilan lewat cache ranking per skema, tanpa
+    mengubah skema aktif global (aman dipanggil dari banyak sesi Streamlit).
+    
+    Args:
+        query (str): query string
+        k (int): jumlah top documents
+        scheme (str): "standard" / "sublinear" / "bm25"; None = pakai scheme aktif
+        verbose (bool): tampilkan header & hasil ke terminal
+    """
+    if scheme is None:
+        scheme = current_scheme
+    elif scheme not in _TFIDF_BUILDERS:
+        raise ValueError(f"Unknown scheme: {scheme}")
+    
+    ranked = _rank_documents(scheme, query, k)
+    if not verbose:
+        return _format_results(query, ranked, False, scheme)
+    
     print(f"\n{'='*60}")
     print(f"🔎 VSM SEARCH MODE")
     print(f"{'='*60}")
-    results = search_vsm(query, top_k=k, verbose=True)
+    results = _format_results(query, ranked, True, scheme)
     
     print(f"\n📋 Top-{k} Results:")
     print(f"{'─'*60}")
@@ -476,6 +866,8 @@ if __name__ == "__main__":
     print("="*60)
     print("🔎 VECTOR SPACE MODEL (VSM) - INFORMATION RETRIEVAL")
     print("="*60)
+    print(f"📊 Vocabulary: {len(vocabulary)} unique terms")
+    print(f"📚 Documents: {N}")
     
     # Run comparison untuk Soal 05 Poin 1
     comparison_results = compare_weighting_schemes(top_k=5)